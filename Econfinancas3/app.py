@@ -1,21 +1,80 @@
 import os
-from flask import Flask, render_template, request, jsonify
+import hashlib
+import sqlite3
+import threading
+from functools import wraps
+from flask import Flask, render_template, request, jsonify, Response, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
-import uuid
-from datetime import datetime
+from sqlalchemy import select, insert, func, lambda_stmt, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from datetime import date, datetime
+from typing import Optional
+import msgspec
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to Flask's stdlib json provider
+    orjson = None
+
+try:
+    from cachetools import TTLCache
+except ImportError:  # cachetools is optional; without it GET responses are not cached
+    TTLCache = None
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider backed by orjson, which serializes responses much faster than stdlib json.
+    """
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_SORT_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 # Initialize Flask app
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 
 # Configure the SQLite database
 # Use instance folder for the database file
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///econfinancas.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Under Gunicorn, keep one pooled connection per thread the worker actually runs (the
+# post_fork hook in gunicorn_conf.py sets the count): every pooled SQLite connection holds
+# its own page cache and mmap, so idle extra connections only cost memory. The overflow
+# absorbs any connection held past that, e.g. by a slow client reading a streamed listing,
+# instead of making other requests wait for the pool. Otherwise keep SQLAlchemy's default pool.
+if os.environ.get('ECONFINANCAS_POOL_SIZE'):
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_size': int(os.environ['ECONFINANCAS_POOL_SIZE']),
+        'max_overflow': 10,
+    }
 
 # Initialize SQLAlchemy
 db = SQLAlchemy(app)
 
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Tunes every new SQLite connection: WAL turns each commit into an append instead of
+    a full journal sync, and the page cache and mmap let reads skip most file I/O.
+    Foreign keys are enforced so an expense can't be saved against a deleted category.
+    """
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA foreign_keys=ON')
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.execute('PRAGMA mmap_size=268435456') # 256 MiB
+    cursor.execute('PRAGMA cache_size=-65536') # 64 MiB
+    cursor.close()
+
 # --- Database Models ---
 
 class Category(db.Model):
@@ -24,8 +83,9 @@ class Category(db.Model):
     """
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(80), unique=True, nullable=False)
-    # Relationship to Expense: 'backref' creates a 'category' attribute on Expense objects
-    expenses = db.relationship('Expense', backref='category_obj', lazy=True)
+    budget = db.Column(db.Float, nullable=False, default=0.0) # Monthly spending limit, 0 means no budget set
+    # Relationship to Expense, paired with Expense.category_obj via back_populates
+    expenses = db.relationship('Expense', back_populates='category_obj')
 
     def __repr__(self):
         return f'<Category {self.name}>'
@@ -34,36 +94,182 @@ class Category(db.Model):
         """Converts the Category object to a dictionary."""
         return {
             'id': self.id,
-            'name': self.name
+            'name': self.name,
+            'budget': self.budget
         }
 
 class Expense(db.Model):
     """
     Represents an individual expense in the database.
     """
-    # Using String for UUID to be compatible with both SQLite and potentially PostgreSQL UUID
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    # Integer autoincrement key: a quarter of the size of a text UUID and cheaper to index
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     value = db.Column(db.Float, nullable=False)
-    date = db.Column(db.String(10), nullable=False) # Stored as YYYY-MM-DD string
+    date = db.Column(db.Date, nullable=False) # Indexed below; exchanged as YYYY-MM-DD in the API
     description = db.Column(db.String(200), nullable=True)
     category_id = db.Column(db.Integer, db.ForeignKey('category.id'), nullable=False)
+    category_obj = db.relationship('Category', back_populates='expenses')
+
+    # Serve the category/date filters and the date DESC ordering of GET /api/expenses from an index
+    __table_args__ = (
+        db.Index('ix_expense_cat_date', category_id, date.desc()),
+        db.Index('ix_expense_date', date.desc()),
+    )
 
     def __repr__(self):
         return f'<Expense {self.value} on {self.date} for {self.description}>'
 
-    def to_dict(self):
-        """Converts the Expense object to a dictionary."""
-        return {
-            'id': self.id,
-            'value': self.value,
-            'date': self.date,
-            'description': self.description,
-            'category': self.category_obj.name if self.category_obj else None, # Include category name
-            'category_id': self.category_id
-        }
+# --- Request Schemas ---
+# Request bodies are decoded and type-checked by msgspec in a single pass; a body that
+# isn't valid JSON or doesn't match the schema is answered with 400 (see handle_invalid_body).
+
+class ExpenseIn(msgspec.Struct):
+    """
+    Body of POST /api/expenses and PUT /api/expenses/<id>.
+    """
+    value: float
+    date: date # Parsed from YYYY-MM-DD
+    category: str
+    description: Optional[str] = None
+
+class CategoryIn(msgspec.Struct):
+    """
+    Body of POST /api/categories and PUT /api/categories/<id>. On PUT, a missing budget is left unchanged.
+    """
+    name: str
+    budget: Optional[float] = None
+
+def expense_dict(expense_id, value, date, description, category_id, category):
+    """
+    Builds the API representation of an expense. The arguments follow the column order
+    of the GET /api/expenses query, so a result row can be passed as expense_dict(*row).
+    """
+    return {
+        'id': expense_id,
+        'value': value,
+        'date': date.isoformat(),
+        'description': description,
+        'category_id': category_id,
+        'category': category
+    }
+
+# --- Category Lookup Cache ---
+
+# Maps category name -> id. Categories change rarely, so the map is loaded once and
+# dropped whenever a category is created, renamed or deleted. The map is never mutated
+# in place: a reload builds a new dict and swaps it in, so concurrent readers always
+# see a complete snapshot. The generation counter stops a reload that started before
+# an invalidation from installing its now stale snapshot afterwards.
+_CATEGORY_CACHE = None
+_CATEGORY_CACHE_GENERATION = 0
+_CATEGORY_CACHE_LOCK = threading.Lock()
+
+def load_category_cache():
+    """(Re)loads the category name -> id map with a single query and returns it."""
+    global _CATEGORY_CACHE
+    with _CATEGORY_CACHE_LOCK:
+        generation = _CATEGORY_CACHE_GENERATION
+    categories = {
+        category_name: category_id
+        for category_id, category_name in db.session.query(Category.id, Category.name).all()
+    }
+    with _CATEGORY_CACHE_LOCK:
+        if generation == _CATEGORY_CACHE_GENERATION:
+            _CATEGORY_CACHE = categories
+    return categories
+
+def invalidate_category_cache():
+    """Drops the category name -> id map; call after committing a category change."""
+    global _CATEGORY_CACHE, _CATEGORY_CACHE_GENERATION
+    with _CATEGORY_CACHE_LOCK:
+        _CATEGORY_CACHE = None
+        _CATEGORY_CACHE_GENERATION += 1
+
+def get_category_id(name):
+    """Returns the id of the category with the given name, or None if it doesn't exist."""
+    categories = _CATEGORY_CACHE
+    if categories is not None:
+        category_id = categories.get(name)
+        if category_id is not None:
+            return category_id
+    # Not loaded yet, or a miss: reload once before reporting the category as missing,
+    # in case it was created by another thread or worker since the map was built
+    return load_category_cache().get(name)
+
+def get_or_create_default_category_id():
+    """
+    Returns the id of the default category 'Outros', creating it if it doesn't exist.
+    Doesn't commit; the caller's transaction includes the insert, so the caller must
+    call invalidate_category_cache() after committing.
+    """
+    category_id = get_category_id('Outros')
+    if category_id is None:
+        # Upsert so a single statement returns the id whether the row is new or already existed
+        stmt = sqlite_insert(Category).values(name='Outros')
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['name'], set_={'name': stmt.excluded.name}
+        ).returning(Category.id)
+        category_id = db.session.execute(stmt).scalar_one()
+    return category_id
+
+# --- Response Cache ---
+
+# Serialized GET responses keyed on (path, query string), as (body, etag, mimetype).
+# Entries expire after 60 seconds and the whole cache is cleared after any write request.
+# The generation counter is bumped on every clear, so a GET that read its data before a
+# concurrent write doesn't store that stale body after the write has cleared the cache.
+RESP_CACHE = TTLCache(maxsize=512, ttl=60) if TTLCache is not None else None
+_RESP_CACHE_GENERATION = 0
+_RESP_CACHE_LOCK = threading.Lock() # TTLCache isn't thread-safe
+
+def cached_response(view):
+    """
+    Caches the body of successful GET responses of a view and answers
+    matching If-None-Match requests with 304 Not Modified. Streamed responses
+    are passed through untouched, as caching them would buffer the whole body.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if RESP_CACHE is None or request.method != 'GET':
+            return view(*args, **kwargs)
+
+        key = (request.path, request.query_string)
+        with _RESP_CACHE_LOCK:
+            cached = RESP_CACHE.get(key)
+            generation = _RESP_CACHE_GENERATION
+        if cached is None:
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.is_streamed:
+                return response
+            body = response.get_data()
+            cached = (body, hashlib.sha1(body).hexdigest(), response.mimetype)
+            with _RESP_CACHE_LOCK:
+                if generation == _RESP_CACHE_GENERATION:
+                    RESP_CACHE[key] = cached
+
+        body, etag, mimetype = cached
+        response = Response(body, mimetype=mimetype)
+        response.set_etag(etag)
+        return response.make_conditional(request)
+    return wrapper
+
+@app.after_request
+def invalidate_response_cache(response):
+    """Drops all cached GET responses once a request may have changed the data."""
+    global _RESP_CACHE_GENERATION
+    if RESP_CACHE is not None and request.method in ('POST', 'PUT', 'DELETE'):
+        with _RESP_CACHE_LOCK:
+            RESP_CACHE.clear()
+            _RESP_CACHE_GENERATION += 1
+    return response
 
 # --- Routes ---
 
+@app.errorhandler(msgspec.DecodeError) # Also raised as its subclass msgspec.ValidationError
+def handle_invalid_body(error):
+    """Rejects request bodies that aren't valid JSON or don't match the expected schema."""
+    return jsonify({'error': f'Invalid request data: {error}'}), 400
+
 @app.route('/')
 def index():
     """Renders the main HTML page."""
@@ -72,6 +278,7 @@ def index():
 # --- API Endpoints for Categories ---
 
 @app.route('/api/categories', methods=['GET', 'POST'])
+@cached_response
 def handle_categories():
     """
     Handles GET requests to retrieve all categories and POST requests to add a new category.
@@ -80,58 +287,74 @@ def handle_categories():
         categories = Category.query.all()
         return jsonify([category.to_dict() for category in categories])
     elif request.method == 'POST':
-        data = request.get_json()
-        name = data.get('name')
+        body = msgspec.json.decode(request.get_data(), type=CategoryIn)
+        name = body.name
+        budget = body.budget or 0.0
         if not name:
             return jsonify({'error': 'Category name is required'}), 400
-        if Category.query.filter_by(name=name).first():
+        if budget < 0:
+            return jsonify({'error': 'Budget cannot be negative'}), 400
+
+        # Let the unique constraint on name detect duplicates: one statement instead of
+        # a SELECT followed by an INSERT, and no race between the two
+        stmt = sqlite_insert(Category).values(name=name, budget=budget).on_conflict_do_nothing(
+            index_elements=['name']
+        ).returning(Category.id)
+        category_id = db.session.execute(stmt).scalar()
+        if category_id is None:
+            db.session.rollback()
             return jsonify({'error': 'Category with this name already exists'}), 409
-
-        new_category = Category(name=name)
-        db.session.add(new_category)
         db.session.commit()
-        return jsonify(new_category.to_dict()), 201
+        invalidate_category_cache()
+        return jsonify({'id': category_id, 'name': name, 'budget': budget}), 201
 
 @app.route('/api/categories/<int:category_id>', methods=['PUT', 'DELETE'])
 def handle_category(category_id):
     """
     Handles PUT requests to update a category and DELETE requests to remove a category.
     """
-    category = Category.query.get(category_id)
+    category = db.session.get(Category, category_id)
     if not category:
         return jsonify({'error': 'Category not found'}), 404
 
     if request.method == 'PUT':
-        data = request.get_json()
-        new_name = data.get('name')
+        body = msgspec.json.decode(request.get_data(), type=CategoryIn)
+        new_name = body.name
         if not new_name:
             return jsonify({'error': 'New category name is required'}), 400
+        if body.budget is not None and body.budget < 0:
+            return jsonify({'error': 'Budget cannot be negative'}), 400
         if Category.query.filter_by(name=new_name).first() and new_name != category.name:
             return jsonify({'error': 'Category with this name already exists'}), 409
 
+        if body.budget is not None:
+            category.budget = body.budget
         category.name = new_name
+        category_dict = category.to_dict() # Serialize before commit expires the object
         db.session.commit()
-        return jsonify(category.to_dict())
+        invalidate_category_cache()
+        return jsonify(category_dict)
 
     elif request.method == 'DELETE':
-        # Get the default category 'Outros'
-        default_category = Category.query.filter_by(name='Outros').first()
-        if not default_category:
-            # If 'Outros' doesn't exist, create it. This should ideally be handled during initial setup.
-            default_category = Category(name='Outros')
-            db.session.add(default_category)
-            db.session.commit() # Commit to get an ID for default_category
-
-        # Reassign expenses from the deleted category to the default category
-        expenses_to_reassign = Expense.query.filter_by(category_id=category.id).all()
-        for expense in expenses_to_reassign:
-            expense.category_id = default_category.id
+        # 'Outros' receives the expenses of deleted categories, so it can't be deleted itself
+        if category.name == 'Outros':
+            return jsonify({'error': 'The default category cannot be deleted'}), 400
+
+        # Get the default category 'Outros', creating it if it doesn't exist
+        default_category_id = get_or_create_default_category_id()
+
+        # Reassign expenses from the deleted category to the default category in a single UPDATE
+        db.session.query(Expense).filter_by(category_id=category.id).update(
+            {'category_id': default_category_id}, synchronize_session=False
+        )
         db.session.delete(category)
         db.session.commit()
+        invalidate_category_cache()
         return jsonify({'message': 'Category deleted and expenses reallocated successfully'}), 200
 
 # --- API Endpoints for Expenses ---
 
+# Not wrapped in @cached_response: the listing is streamed to keep memory per request bounded
 @app.route('/api/expenses', methods=['GET', 'POST'])
 def handle_expenses():
     """
@@ -143,102 +366,170 @@ def handle_expenses():
         category_filter = request.args.get('category')
         date_filter = request.args.get('date')
 
-        query = Expense.query
+        # Select plain columns joined with the category name instead of building Expense objects.
+        # lambda_stmt caches the constructed statement, so it isn't rebuilt on every request.
+        stmt = lambda_stmt(lambda: select(
+            Expense.id, Expense.value, Expense.date, Expense.description,
+            Expense.category_id, Category.name
+        ).join(Category).order_by(Expense.date.desc())) # Order by date descending
 
         if category_filter:
-            category_obj = Category.query.filter_by(name=category_filter).first()
-            if category_obj:
-                query = query.filter_by(category_id=category_obj.id)
+            category_id = get_category_id(category_filter)
+            if category_id is not None:
+                stmt = stmt.add_criteria(lambda s: s.where(Expense.category_id == category_id))
             else:
                 return jsonify({'error': 'Category not found for filtering'}), 404
 
         if date_filter:
-            query = query.filter_by(date=date_filter)
-
-        expenses = query.order_by(Expense.date.desc()).all() # Order by date descending
-        return jsonify([expense.to_dict() for expense in expenses])
+            try:
+                date_filter = datetime.strptime(date_filter, '%Y-%m-%d').date()
+            except ValueError:
+                return jsonify({'error': 'Invalid date format, expected YYYY-MM-DD'}), 400
+            stmt = stmt.add_criteria(lambda s: s.where(Expense.date == date_filter))
+
+        def generate():
+            # Stream the JSON array row by row, fetching 500 rows at a time, so the
+            # full result set never has to be held in memory
+            yield '['
+            rows = db.session.execute(stmt, execution_options={'yield_per': 500})
+            for i, row in enumerate(rows):
+                if i:
+                    yield ','
+                yield app.json.dumps(expense_dict(*row))
+            yield ']'
+
+        return Response(stream_with_context(generate()), mimetype='application/json')
 
     elif request.method == 'POST':
-        data = request.get_json()
-        value = data.get('value')
-        date = data.get('date')
-        category_name = data.get('category')
-        description = data.get('description')
-
-        if not all([value, date, category_name]):
-            return jsonify({'error': 'Value, date, and category are required'}), 400
-
-        try:
-            value = float(value)
-            if value <= 0:
-                return jsonify({'error': 'Value must be positive'}), 400
-        except ValueError:
-            return jsonify({'error': 'Invalid value format'}), 400
-
-        # Find or create category
-        category = Category.query.filter_by(name=category_name).first()
-        if not category:
-            # This case should ideally not happen if categories are pre-loaded or added via UI
-            # For robustness, we can create it or default to 'Outros'
-            default_category = Category.query.filter_by(name='Outros').first()
-            if not default_category:
-                default_category = Category(name='Outros')
-                db.session.add(default_category)
-                db.session.commit()
-            category = default_category # Assign to default category if provided category doesn't exist
-
-        new_expense = Expense(
-            value=value,
-            date=date,
-            description=description,
-            category_id=category.id
+        body = msgspec.json.decode(request.get_data(), type=ExpenseIn)
+        value = body.value
+        expense_date = body.date
+        category_name = body.category
+        description = body.description
+
+        if not category_name:
+            return jsonify({'error': 'Category is required'}), 400
+        if value <= 0:
+            return jsonify({'error': 'Value must be positive'}), 400
+
+        requested_category_name = category_name
+        for attempt in range(2):
+            # Find or create category
+            category_name = requested_category_name
+            category_id = get_category_id(category_name)
+            if category_id is None:
+                # This case should ideally not happen if categories are pre-loaded or added via UI
+                # For robustness, we can create it or default to 'Outros'
+                category_name = 'Outros'
+                category_id = get_or_create_default_category_id() # Assign to default category if provided category doesn't exist
+
+            new_expense = Expense(
+                value=value,
+                date=expense_date,
+                description=description,
+                category_id=category_id
+            )
+            db.session.add(new_expense)
+            try:
+                db.session.flush() # Assigns the id
+                break
+            except IntegrityError:
+                # The cached id belongs to a category deleted since the map was loaded
+                # (e.g. by another worker): reload the map and try once more
+                db.session.rollback()
+                if attempt:
+                    raise
+                invalidate_category_cache()
+        # Build the response from the known values: reading the expense after commit
+        # would reload it and then lazily load its category
+        new_expense_dict = expense_dict(
+            new_expense.id, value, expense_date, description, category_id, category_name
         )
-        db.session.add(new_expense)
         db.session.commit()
-        return jsonify(new_expense.to_dict()), 201
+        if category_name != requested_category_name:
+            invalidate_category_cache() # The fallback may have created 'Outros'
+        return jsonify(new_expense_dict), 201
 
-@app.route('/api/expenses/<string:expense_id>', methods=['PUT', 'DELETE'])
+@app.route('/api/expenses/<int:expense_id>', methods=['PUT', 'DELETE'])
 def handle_expense(expense_id):
     """
     Handles PUT requests to update an expense and DELETE requests to remove an expense.
     """
-    expense = Expense.query.get(expense_id)
+    expense = db.session.get(Expense, expense_id)
     if not expense:
         return jsonify({'error': 'Expense not found'}), 404
 
     if request.method == 'PUT':
-        data = request.get_json()
-        value = data.get('value')
-        date = data.get('date')
-        category_name = data.get('category')
-        description = data.get('description')
-
-        if not all([value, date, category_name]):
-            return jsonify({'error': 'Value, date, and category are required'}), 400
-
-        try:
-            value = float(value)
-            if value <= 0:
-                return jsonify({'error': 'Value must be positive'}), 400
-        except ValueError:
-            return jsonify({'error': 'Invalid value format'}), 400
-
-        category = Category.query.filter_by(name=category_name).first()
-        if not category:
-            return jsonify({'error': 'Category not found'}), 404
-
-        expense.value = value
-        expense.date = date
-        expense.description = description
-        expense.category_id = category.id
-        db.session.commit()
-        return jsonify(expense.to_dict())
+        body = msgspec.json.decode(request.get_data(), type=ExpenseIn)
+        value = body.value
+        expense_date = body.date
+        category_name = body.category
+        description = body.description
+
+        if not category_name:
+            return jsonify({'error': 'Category is required'}), 400
+        if value <= 0:
+            return jsonify({'error': 'Value must be positive'}), 400
+
+        for attempt in range(2):
+            category_id = get_category_id(category_name)
+            if category_id is None:
+                return jsonify({'error': 'Category not found'}), 404
+
+            expense.value = value
+            expense.date = expense_date
+            expense.description = description
+            expense.category_id = category_id
+            try:
+                db.session.commit()
+                break
+            except IntegrityError:
+                # The cached id belongs to a category deleted since the map was loaded
+                # (e.g. by another worker): reload the map and try once more
+                db.session.rollback()
+                if attempt:
+                    raise
+                invalidate_category_cache()
+        return jsonify(expense_dict(
+            expense_id, value, expense_date, description, category_id, category_name
+        ))
 
     elif request.method == 'DELETE':
         db.session.delete(expense)
         db.session.commit()
         return jsonify({'message': 'Expense deleted successfully'}), 200
 
+@app.route('/api/expenses/summary', methods=['GET'])
+@cached_response
+def expenses_summary():
+    """
+    Returns the total spent per category alongside its monthly budget, aggregated in SQL
+    so clients don't need to fetch every expense to compute it. Pass 'month' (YYYY-MM) to
+    total only that month, the period the budget applies to; without it, all expenses count.
+    """
+    join_condition = Expense.category_id == Category.id
+    month_filter = request.args.get('month')
+    if month_filter:
+        try:
+            month_start = datetime.strptime(month_filter, '%Y-%m').date()
+        except ValueError:
+            return jsonify({'error': 'Invalid month format, expected YYYY-MM'}), 400
+        if month_start.month == 12:
+            next_month_start = month_start.replace(year=month_start.year + 1, month=1)
+        else:
+            next_month_start = month_start.replace(month=month_start.month + 1)
+        # Filter in the join, not in WHERE, so categories without expenses that month still appear
+        join_condition &= (Expense.date >= month_start) & (Expense.date < next_month_start)
+
+    rows = db.session.query(
+        Category.id, Category.name, Category.budget,
+        func.coalesce(func.sum(Expense.value), 0.0).label('spent')
+    ).outerjoin(Expense, join_condition).group_by(Category.id).order_by(Category.id).all()
+    return jsonify([
+        {'id': row.id, 'name': row.name, 'budget': row.budget, 'spent': row.spent}
+        for row in rows
+    ])
+
 @app.route('/api/reset_data', methods=['DELETE'])
 def reset_data():
     """
@@ -255,34 +546,28 @@ def reset_data():
 # --- Database Initialization (Run this once to create tables) ---
 # To run this, open a Python shell in your project directory:
 # > python
-# > from app import app, db
+# > from app import app, init_db
 # > with app.app_context():
-# >     db.create_all()
-# >     # Optional: Add default categories if they don't exist
-# >     if not Category.query.filter_by(name='Alimentação').first():
-# >         db.session.add(Category(name='Alimentação'))
-# >         db.session.add(Category(name='Transporte'))
-# >         db.session.add(Category(name='Lazer'))
-# >         db.session.add(Category(name='Moradia'))
-# >         db.session.add(Category(name='Saúde'))
-# >         db.session.add(Category(name='Educação'))
-# >         db.session.add(Category(name='Outros'))
-# >         db.session.commit()
+# >     init_db()
 # > exit()
 
+DEFAULT_CATEGORIES = ('Alimentação', 'Transporte', 'Lazer', 'Moradia', 'Saúde', 'Educação', 'Outros')
+
+def init_db():
+    """
+    Creates the tables and adds the default categories if they don't exist.
+    Must be called inside an application context.
+    """
+    db.create_all()
+    if not Category.query.filter_by(name='Alimentação').first():
+        # A single multi-row INSERT instead of one INSERT per category
+        db.session.execute(insert(Category), [{'name': name} for name in DEFAULT_CATEGORIES])
+        db.session.commit()
+
 if __name__ == '__main__':
-    # This block is for direct execution and development.
-    # In a production environment, you'd typically use a WSGI server (e.g., Gunicorn).
+    # Running this file only creates the database. Serve the app with Gunicorn:
+    # > gunicorn -c gunicorn_conf.py app:app
+    # or, for development with auto-reloading, with Flask's dev server:
+    # > flask --app app run --debug
     with app.app_context():
-        db.create_all()
-        # Add default categories if they don't exist on initial setup
-        if not Category.query.filter_by(name='Alimentação').first():
-            db.session.add(Category(name='Alimentação'))
-            db.session.add(Category(name='Transporte'))
-            db.session.add(Category(name='Lazer'))
-            db.session.add(Category(name='Moradia'))
-            db.session.add(Category(name='Saúde'))
-            db.session.add(Category(name='Educação'))
-            db.session.add(Category(name='Outros'))
-            db.session.commit()
-    app.run(debug=True) # debug=True enables auto-reloading and better error messages
+        init_db()
@@ -0,0 +1,44 @@
+# Gunicorn configuration for EconFinancas
+# Usage (from this folder, after running `python app.py` once to create the database):
+# > gunicorn -c gunicorn_conf.py app:app
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '127.0.0.1:8000')
+
+# The category lookup cache and the response cache in app.py live in each process and
+# are only invalidated by writes handled in that same process, so run a single worker
+# by default. With extra workers (WEB_CONCURRENCY), a worker can still resolve a category
+# another worker deleted: saving an expense against it is rejected by the foreign key and
+# retried with a reloaded map, but an expense sent with a renamed category's old name is
+# filed under the renamed category, and cached category lists and summaries can be up to
+# 60 seconds stale.
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+
+# Threads rather than gevent greenlets: sqlite3 isn't cooperative under gevent, so a
+# greenlet waiting on the database would block the whole worker, while sqlite3
+# releases the GIL and lets other threads run during queries and commits.
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 2 * (os.cpu_count() or 1) + 1))
+
+timeout = 30
+
+def post_fork(server, worker):
+    """
+    Tells app.py, which each worker imports after this hook runs, how many threads the worker
+    serves so it can size its connection pool. worker.cfg reflects the final settings,
+    including --threads and GUNICORN_CMD_ARGS overrides.
+    """
+    os.environ['ECONFINANCAS_POOL_SIZE'] = str(worker.cfg.threads)
+
+def post_worker_init(worker):
+    """
+    Warms the category cache in each worker so its first requests don't pay for loading it.
+    This is only an optimisation: on failure (e.g. the database hasn't been created yet)
+    the error is logged and the cache is loaded on first use instead.
+    """
+    from app import app, load_category_cache
+    try:
+        with app.app_context():
+            load_category_cache()
+    except Exception:
+        worker.log.warning('Could not warm the category cache', exc_info=True)
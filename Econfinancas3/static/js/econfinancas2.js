@@ -256,7 +256,7 @@ async function addOrUpdateExpense(event) {
 
 /**
  * Populates the expense form for editing.
- * @param {string} id - The ID of the expense to be edited.
+ * @param {number} id - The ID of the expense to be edited.
  */
 async function editExpense(id) {
     const expense = expenses.find(exp => exp.id === id);
@@ -275,7 +275,7 @@ async function editExpense(id) {
 
 /**
  * Deletes an expense via the backend API.
- * @param {string} id - The ID of the expense to be deleted.
+ * @param {number} id - The ID of the expense to be deleted.
  */
 function deleteExpense(id) {
     showConfirmationModal(
@@ -335,8 +335,8 @@ function renderExpenses() {
             <td>${expense.category}</td>
             <td>${expense.description || '-'}</td>
             <td>
-                <button class="btn-edit" onclick="editExpense('${expense.id}')">Editar</button>
-                <button class="btn-delete" onclick="deleteExpense('${expense.id}')">Excluir</button>
+                <button class="btn-edit" onclick="editExpense(${expense.id})">Editar</button>
+                <button class="btn-delete" onclick="deleteExpense(${expense.id})">Excluir</button>
             </td>
         `;
     });